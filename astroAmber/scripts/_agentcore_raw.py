@@ -0,0 +1,173 @@
+"""
+Lightweight AgentCore control-plane client that signs requests with SigV4 and sends them over urllib3.
+It skips boto3's service-model loading and mirrors the subset of the boto3 client API the scripts use.
+"""
+
+import json
+import os
+from functools import lru_cache
+from types import SimpleNamespace
+from urllib.parse import quote, urlencode, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+SIGNING_NAME = 'bedrock-agentcore'
+
+# Retried with backoff; after the last attempt the service's own error response is returned
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class AgentCoreControlError(Exception):
+    """Error response from the control plane, carrying the service error code."""
+
+    def __init__(self, code, message, status):
+        super().__init__(f"An error occurred ({code}): {message}")
+        self.code = code
+        self.status = status
+
+def _endpoint_url(region):
+    """Return the control-plane URL, honouring the same endpoint overrides as boto3."""
+    return (
+        os.environ.get('AWS_ENDPOINT_URL_BEDROCK_AGENTCORE_CONTROL')
+        or os.environ.get('AWS_ENDPOINT_URL')
+        or f"https://bedrock-agentcore-control.{region}.amazonaws.com"
+    ).rstrip('/')
+
+def _pool_manager(base_url, **kwargs):
+    """Return a urllib3 pool manager, routed through HTTP(S)_PROXY unless NO_PROXY exempts the host."""
+    import urllib3
+
+    parts = urlsplit(base_url)
+    proxy_url = getproxies().get(parts.scheme)
+    if proxy_url and not proxy_bypass(parts.hostname):
+        return urllib3.ProxyManager(proxy_url, **kwargs)
+    return urllib3.PoolManager(**kwargs)
+
+class _EndpointPageIterator:
+    """Minimal stand-in for botocore's PageIterator over list_agent_runtime_endpoints."""
+
+    def __init__(self, client, agent_runtime_id, page_size):
+        self._client = client
+        self._agent_runtime_id = agent_runtime_id
+        self._page_size = page_size
+
+    def __iter__(self):
+        next_token = None
+        while True:
+            params = {'agentRuntimeId': self._agent_runtime_id}
+            if self._page_size:
+                params['maxResults'] = self._page_size
+            if next_token:
+                params['nextToken'] = next_token
+
+            page = self._client.list_agent_runtime_endpoints(**params)
+            yield page
+
+            next_token = page.get('nextToken')
+            if not next_token:
+                return
+
+    def search(self, expression):
+        """Yield the items of every page for a '<key>[]' expression, the only form the scripts use.
+
+        Like botocore, a page without the key yields a single None.
+        """
+        key = expression.removesuffix('[]')
+        for page in self:
+            items = page.get(key)
+            if isinstance(items, list):
+                yield from items
+            else:
+                yield items
+
+class _EndpointPaginator:
+    def __init__(self, client):
+        self._client = client
+
+    def paginate(self, agentRuntimeId, PaginationConfig=None):
+        page_size = (PaginationConfig or {}).get('PageSize')
+        return _EndpointPageIterator(self._client, agentRuntimeId, page_size)
+
+class AgentCoreControlClient:
+    """Drop-in for the boto3 'bedrock-agentcore-control' client's endpoint operations."""
+
+    def __init__(self, region):
+        # botocore.session resolves credentials without loading any service model
+        import urllib3
+        from botocore.session import Session
+
+        self.meta = SimpleNamespace(region_name=region)
+        self._base_url = _endpoint_url(region)
+        self._credentials = Session().get_credentials()
+        self._http = _pool_manager(
+            self._base_url,
+            maxsize=10,
+            timeout=urllib3.Timeout(connect=5, read=30),
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=_RETRY_STATUSES,
+                allowed_methods=None,
+                raise_on_status=False
+            )
+        )
+
+    def _request(self, method, path, body=None, query=None):
+        """Sign and send a single request, returning the decoded JSON response."""
+        from botocore.auth import SigV4Auth
+        from botocore.awsrequest import AWSRequest
+
+        url = self._base_url + path
+        if query:
+            url += '?' + urlencode(query)
+        data = json.dumps(body) if body is not None else None
+
+        request = AWSRequest(method=method, url=url, data=data, headers={'Content-Type': 'application/json'})
+        SigV4Auth(self._credentials, SIGNING_NAME, self.meta.region_name).add_auth(request)
+
+        response = self._http.request(method, url, body=data, headers=dict(request.headers.items()))
+        try:
+            payload = json.loads(response.data) if response.data else {}
+        except ValueError:
+            # Proxies and load balancers can answer with HTML or plain text
+            payload = None
+
+        if response.status >= 300:
+            body = payload if isinstance(payload, dict) else {}
+            error_type = response.headers.get('x-amzn-ErrorType') or body.get('__type', 'UnknownError')
+            code = error_type.split(':')[0].split('#')[-1]
+            message = body.get('message') or body.get('Message') or response.data.decode('utf-8', 'replace').strip()
+            raise AgentCoreControlError(code, message, response.status)
+        if not isinstance(payload, dict):
+            raise AgentCoreControlError('InvalidResponse', 'Response body is not a JSON object', response.status)
+        return payload
+
+    @staticmethod
+    def _endpoints_path(agent_runtime_id, endpoint_name=None):
+        path = f"/runtimes/{quote(agent_runtime_id, safe='')}/runtime-endpoints/"
+        if endpoint_name:
+            path += f"{quote(endpoint_name, safe='')}/"
+        return path
+
+    def create_agent_runtime_endpoint(self, agentRuntimeId, **body):
+        return self._request('PUT', self._endpoints_path(agentRuntimeId), body=body)
+
+    def get_agent_runtime_endpoint(self, agentRuntimeId, endpointName):
+        return self._request('GET', self._endpoints_path(agentRuntimeId, endpointName))
+
+    def update_agent_runtime_endpoint(self, agentRuntimeId, endpointName, **body):
+        return self._request('PUT', self._endpoints_path(agentRuntimeId, endpointName), body=body)
+
+    def delete_agent_runtime_endpoint(self, agentRuntimeId, endpointName):
+        return self._request('DELETE', self._endpoints_path(agentRuntimeId, endpointName))
+
+    def list_agent_runtime_endpoints(self, agentRuntimeId, **query):
+        return self._request('POST', self._endpoints_path(agentRuntimeId), query=query)
+
+    def get_paginator(self, operation_name):
+        if operation_name != 'list_agent_runtime_endpoints':
+            raise ValueError(f"No paginator for operation '{operation_name}'")
+        return _EndpointPaginator(self)
+
+@lru_cache(maxsize=None)
+def get_raw_client(region):
+    """Return a cached raw control-plane client for the given region."""
+    return AgentCoreControlClient(region)
@@ -0,0 +1,73 @@
+"""
+Small on-disk TTL cache for read-only control-plane responses.
+Entries are JSON files under ~/.cache/astroamber, so repeated --get/--list polls skip the API call.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+CACHE_DIR = os.path.expanduser("~/.cache/astroamber")
+
+# Endpoint metadata changes on minute-or-slower timescales
+DEFAULT_TTL = 60
+
+def _path(key):
+    """Return the file that stores the entry for key."""
+    digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.json")
+
+def get_with_age(key, ttl=DEFAULT_TTL):
+    """Return (value, age in seconds) for an entry younger than ttl seconds, else (None, None)."""
+    try:
+        with open(_path(key)) as f:
+            entry = json.load(f)
+        age = time.time() - entry['storedAt']
+        value = entry['value']
+    except (OSError, ValueError, KeyError, TypeError):
+        # Unreadable, truncated or foreign files are treated as a miss
+        return None, None
+
+    if age > ttl:
+        return None, None
+    return value, age
+
+def get(key, ttl=DEFAULT_TTL):
+    """Return the value stored under key if it is younger than ttl seconds, else None."""
+    return get_with_age(key, ttl)[0]
+
+def set(key, value):
+    """Store value under key. The cache is best-effort, so write failures are ignored."""
+    path = _path(key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file and rename so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            # Timestamps come back from boto3 as datetimes; their str() is what the scripts print
+            json.dump({'storedAt': time.time(), 'value': value}, f, default=str)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def delete(key):
+    """Remove the entry stored under key, if any."""
+    try:
+        os.remove(_path(key))
+    except OSError:
+        pass
+
+def endpoint_key(region, agent_runtime_id, endpoint_name):
+    """Cache key for a single endpoint's details."""
+    return ['endpoint', region, agent_runtime_id, endpoint_name]
+
+def listing_key(region, agent_runtime_id, verbose=False):
+    """Cache key for the endpoint listing of an agent runtime."""
+    return ['listing', region, agent_runtime_id, verbose]
+
+def invalidate_endpoint(region, agent_runtime_id, endpoint_name):
+    """Drop every cached response that a create, update or delete of the endpoint makes stale."""
+    delete(endpoint_key(region, agent_runtime_id, endpoint_name))
+    delete(listing_key(region, agent_runtime_id, verbose=False))
+    delete(listing_key(region, agent_runtime_id, verbose=True))
@@ -0,0 +1,72 @@
+"""
+Shared AgentCore control-plane client used by the endpoint management scripts.
+By default requests go through the lightweight SigV4 client; boto3 is kept as a fallback
+and, when used, loads its service model only once per region.
+"""
+
+import sys
+from functools import lru_cache
+import _agentcore_raw
+
+@lru_cache(maxsize=None)
+def get_agentcore_control_client(region):
+    """Return a cached AgentCore control-plane client for the given region."""
+    # boto3 is imported here so --help and argument errors never pay for loading it
+    import boto3
+    from botocore.config import Config
+
+    # Keep pooled connections alive between calls and let botocore back off on throttling
+    config = Config(
+        max_pool_connections=20,
+        tcp_keepalive=True,
+        retries={'mode': 'adaptive', 'max_attempts': 5},
+        connect_timeout=5,
+        read_timeout=30
+    )
+    return boto3.session.Session().client('bedrock-agentcore-control', region_name=region, config=config)
+
+def get_client(region, use_boto3=False):
+    """Return the cached control-plane client for the region, raw SigV4 unless boto3 is requested."""
+    if use_boto3:
+        return get_agentcore_control_client(region)
+    return _agentcore_raw.get_raw_client(region)
+
+def is_stale_connection_error(exc):
+    """Return True if the error was caused by a pooled connection the server already closed."""
+    from botocore.exceptions import ConnectionClosedError
+
+    if isinstance(exc, ConnectionClosedError):
+        return True
+    message = str(exc)
+    return any(marker in message for marker in ('Connection reset by peer', 'RemoteDisconnected', 'Connection aborted'))
+
+def call_with_stale_retry(client, operation, **kwargs):
+    """Invoke a client operation, rebuilding the client and retrying once on a stale connection."""
+    try:
+        return getattr(client, operation)(**kwargs)
+    except Exception as e:
+        if not is_stale_connection_error(e):
+            raise
+        use_boto3 = not isinstance(client, _agentcore_raw.AgentCoreControlClient)
+        get_agentcore_control_client.cache_clear()
+        _agentcore_raw.get_raw_client.cache_clear()
+        client = get_client(client.meta.region_name, use_boto3)
+        return getattr(client, operation)(**kwargs)
+
+def error_code(exc):
+    """Return the service error code of a control-plane error (boto3 or raw client), or None."""
+    response = getattr(exc, 'response', None)
+    if isinstance(response, dict):
+        return response.get('Error', {}).get('Code')
+    return getattr(exc, 'code', None)
+
+def exit_on_error(exc, messages, default="✗ Error: {error}"):
+    """Print the message registered for the error's code (or the default) and exit with status 1.
+
+    Matching on the error code avoids resolving client.exceptions.* classes, which boto3 synthesizes
+    on first access and which differ between the boto3 and raw clients. '{error}' in a message is
+    replaced with the exception text.
+    """
+    message = messages.get(error_code(exc), default)
+    sys.stdout.write(message.replace('{error}', str(exc)) + "\n")
+    sys.exit(1)
@@ -4,21 +4,52 @@ Script to create AgentCore Runtime endpoints.
 Usage: python create_endpoint.py --agent-runtime-id <id> --name <name> --version <version>
 """
 
-import boto3
 import argparse
 import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+import _cache
+from _client import call_with_stale_retry, exit_on_error, get_client
 
-def create_endpoint(agent_runtime_id, name, version=None, description=None, tags=None, region='eu-central-1'):
+_ENDPOINT_NOT_FOUND = {'ResourceNotFoundException': "✗ Error: Endpoint not found"}
+
+# Statuses after which an endpoint will not change without another create/update call
+_TERMINAL_STATUSES = ('READY', 'CREATE_FAILED', 'UPDATE_FAILED')
+
+_ENDPOINT_FIELDS = ('name', 'status', 'liveVersion', 'targetVersion', 'description', 'createdAt', 'lastUpdatedAt', 'agentRuntimeEndpointArn')
+_get_endpoint_fields = itemgetter(*_ENDPOINT_FIELDS)
+
+def _endpoint_fields(endpoint):
+    """Return the display fields of an endpoint in one lookup, with None for any the response omits."""
+    try:
+        return _get_endpoint_fields(endpoint)
+    except KeyError:
+        return tuple(map(endpoint.get, _ENDPOINT_FIELDS))
+
+def _cached_marker(age):
+    """Return the suffix that flags output served from the local cache, or '' for a live response."""
+    return f" (cached {int(age)}s ago)" if age is not None else ""
+
+def _kv_pair(value):
+    """argparse type that parses a KEY=VALUE tag, rejecting bad input before any client is built."""
+    key, separator, tag_value = value.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Invalid tag format '{value}'. Use KEY=VALUE")
+    return key, tag_value
+
+def create_endpoint(client, agent_runtime_id, name, version=None, description=None, tags=None):
     """Create a new AgentCore Runtime endpoint."""
     
-    client = boto3.client('bedrock-agentcore-control', region_name=region)
-    
     try:
         print(f"Creating endpoint '{name}'...")
         
+        # A fixed client token keeps a stale-connection retry idempotent
         request_params = {
             'agentRuntimeId': agent_runtime_id,
-            'name': name
+            'name': name,
+            'clientToken': str(uuid.uuid4())
         }
         
         if version:
@@ -33,34 +64,72 @@ def create_endpoint(agent_runtime_id, name, version=None, description=None, tags
         if tags:
             request_params['tags'] = tags
         
-        response = client.create_agent_runtime_endpoint(**request_params)
+        response = call_with_stale_retry(client, 'create_agent_runtime_endpoint', **request_params)
+        _cache.invalidate_endpoint(client.meta.region_name, agent_runtime_id, name)
         
-        print(f"\n✓ Endpoint created successfully!")
-        print(f"  Endpoint Name: {response['endpointName']}")
-        print(f"  Status: {response['status']}")
-        print(f"  Target Version: {response.get('targetVersion', 'Latest')}")
-        print(f"  Endpoint ARN: {response['agentRuntimeEndpointArn']}")
-        print(f"  Created At: {response['createdAt']}")
+        sys.stdout.write(
+            f"\n✓ Endpoint created successfully!\n"
+            f"  Endpoint Name: {response['endpointName']}\n"
+            f"  Status: {response['status']}\n"
+            f"  Target Version: {response.get('targetVersion', 'Latest')}\n"
+            f"  Endpoint ARN: {response['agentRuntimeEndpointArn']}\n"
+            f"  Created At: {response['createdAt']}\n"
+        )
         
         return response
         
-    except client.exceptions.ConflictException:
-        print(f"✗ Error: Endpoint '{name}' already exists")
-        sys.exit(1)
-    except client.exceptions.ResourceNotFoundException:
-        print(f"✗ Error: Agent runtime not found")
-        sys.exit(1)
-    except client.exceptions.ValidationException as e:
-        print(f"✗ Validation Error: {e}")
-        sys.exit(1)
     except Exception as e:
-        print(f"✗ Error: {e}")
-        sys.exit(1)
+        exit_on_error(e, {
+            'ConflictException': f"✗ Error: Endpoint '{name}' already exists",
+            'ResourceNotFoundException': "✗ Error: Agent runtime not found",
+            'ValidationException': "✗ Validation Error: {error}"
+        })
 
-def delete_endpoint(agent_runtime_id, endpoint_name, region='eu-central-1'):
-    """Delete an AgentCore Runtime endpoint."""
+def wait_for_endpoint(client, agent_runtime_id, endpoint_name, timeout=600):
+    """Poll an endpoint with exponential backoff until it reaches a terminal status."""
     
-    client = boto3.client('bedrock-agentcore-control', region_name=region)
+    try:
+        print(f"\nWaiting for endpoint '{endpoint_name}' to become ready...")
+        
+        deadline = time.monotonic() + timeout
+        delay = 1
+        
+        while True:
+            # Polls reuse the same client, so the TLS connection and credentials are set up only once
+            response = client.get_agent_runtime_endpoint(
+                agentRuntimeId=agent_runtime_id,
+                endpointName=endpoint_name
+            )
+            status = response['status']
+            
+            if status in _TERMINAL_STATUSES:
+                break
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"✗ Error: Timed out after {timeout}s with status {status}")
+                sys.exit(1)
+            
+            print(f"  Status: {status}")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 15)
+        
+        _cache.invalidate_endpoint(client.meta.region_name, agent_runtime_id, endpoint_name)
+        
+        if status != 'READY':
+            failure_reason = response.get('failureReason')
+            print(f"✗ Error: Endpoint ended in status {status}" + (f": {failure_reason}" if failure_reason else ""))
+            sys.exit(1)
+        
+        print(f"✓ Endpoint is READY (live version: {response.get('liveVersion', 'N/A')})")
+        
+        return response
+        
+    except Exception as e:
+        exit_on_error(e, _ENDPOINT_NOT_FOUND)
+
+def delete_endpoint(client, agent_runtime_id, endpoint_name):
+    """Delete an AgentCore Runtime endpoint."""
     
     try:
         print(f"Deleting endpoint '{endpoint_name}'...")
@@ -69,82 +138,113 @@ def delete_endpoint(agent_runtime_id, endpoint_name, region='eu-central-1'):
             agentRuntimeId=agent_runtime_id,
             endpointName=endpoint_name
         )
+        _cache.invalidate_endpoint(client.meta.region_name, agent_runtime_id, endpoint_name)
         
         print(f"✓ Endpoint deletion initiated")
         print(f"  Status: {response.get('status', 'DELETING')}")
         
         return response
         
-    except client.exceptions.ResourceNotFoundException:
-        print(f"✗ Error: Endpoint not found")
-        sys.exit(1)
     except Exception as e:
-        print(f"✗ Error: {e}")
-        sys.exit(1)
+        exit_on_error(e, _ENDPOINT_NOT_FOUND)
 
-def get_endpoint(agent_runtime_id, endpoint_name, region='eu-central-1'):
-    """Get details of a specific endpoint."""
-    
-    client = boto3.client('bedrock-agentcore-control', region_name=region)
+def get_endpoint(client, agent_runtime_id, endpoint_name, use_cache=True):
+    """Get details of a specific endpoint, served from the local cache when fresh."""
     
     try:
-        response = client.get_agent_runtime_endpoint(
-            agentRuntimeId=agent_runtime_id,
-            endpointName=endpoint_name
-        )
+        cache_key = _cache.endpoint_key(client.meta.region_name, agent_runtime_id, endpoint_name)
+        response, age = _cache.get_with_age(cache_key) if use_cache else (None, None)
+        
+        if response is None:
+            response = client.get_agent_runtime_endpoint(
+                agentRuntimeId=agent_runtime_id,
+                endpointName=endpoint_name
+            )
+            _cache.set(cache_key, response)
         
-        print(f"\nEndpoint Details:")
-        print("-" * 80)
-        print(f"  Name: {response['name']}")
-        print(f"  Status: {response['status']}")
-        print(f"  Live Version: {response.get('liveVersion', 'N/A')}")
-        print(f"  Target Version: {response.get('targetVersion', 'N/A')}")
-        print(f"  Description: {response.get('description', 'N/A')}")
-        print(f"  Created At: {response['createdAt']}")
-        print(f"  Last Updated: {response['lastUpdatedAt']}")
-        print(f"  Endpoint ARN: {response['agentRuntimeEndpointArn']}")
-        print("-" * 80)
+        name, status, live_version, target_version, description, created_at, updated_at, arn = _endpoint_fields(response)
+        separator = "-" * 80
+        sys.stdout.write(
+            f"\nEndpoint Details{_cached_marker(age)}:\n"
+            f"{separator}\n"
+            f"  Name: {name}\n"
+            f"  Status: {status}\n"
+            f"  Live Version: {live_version or 'N/A'}\n"
+            f"  Target Version: {target_version or 'N/A'}\n"
+            f"  Description: {description or 'N/A'}\n"
+            f"  Created At: {created_at}\n"
+            f"  Last Updated: {updated_at}\n"
+            f"  Endpoint ARN: {arn}\n"
+            f"{separator}\n"
+        )
         
         return response
         
-    except client.exceptions.ResourceNotFoundException:
-        print(f"✗ Error: Endpoint not found")
-        sys.exit(1)
     except Exception as e:
-        print(f"✗ Error: {e}")
-        sys.exit(1)
+        exit_on_error(e, _ENDPOINT_NOT_FOUND)
 
-def list_endpoints(agent_runtime_id, region='eu-central-1'):
-    """List all endpoints for an agent runtime."""
-    
-    client = boto3.client('bedrock-agentcore-control', region_name=region)
+def list_endpoints(client, agent_runtime_id, verbose=False, use_cache=True):
+    """List all endpoints for an agent runtime, optionally with full details for each."""
     
     try:
-        response = client.list_agent_runtime_endpoints(
-            agentRuntimeId=agent_runtime_id
-        )
+        cache_key = _cache.listing_key(client.meta.region_name, agent_runtime_id, verbose)
+        endpoints, age = _cache.get_with_age(cache_key) if use_cache else (None, None)
         
-        endpoints = response.get('agentRuntimeEndpoints', [])
+        if endpoints is None:
+            # Follow nextToken so accounts with many endpoints are not truncated
+            paginator = client.get_paginator('list_agent_runtime_endpoints')
+            pages = paginator.paginate(
+                agentRuntimeId=agent_runtime_id,
+                PaginationConfig={'PageSize': 100}
+            )
+            
+            # search() yields None for a page without the key, so skip those
+            endpoints = [endpoint for endpoint in pages.search('runtimeEndpoints[]') if endpoint is not None]
+            
+            if verbose:
+                # Fan the per-endpoint lookups out over the client's connection pool instead of
+                # paying one round-trip after another
+                with ThreadPoolExecutor(max_workers=10) as executor:
+                    endpoints = list(executor.map(
+                        lambda endpoint: client.get_agent_runtime_endpoint(
+                            agentRuntimeId=agent_runtime_id,
+                            endpointName=endpoint['name']
+                        ),
+                        endpoints
+                    ))
+            
+            _cache.set(cache_key, endpoints)
         
         if not endpoints:
             print(f"\nNo endpoints found for {agent_runtime_id}")
             return
         
-        print(f"\nEndpoints for {agent_runtime_id}:")
-        print("=" * 80)
+        # Collect every line first so the whole listing goes out in a single write
+        separator = "-" * 80
+        lines = [f"\nEndpoints for {agent_runtime_id}{_cached_marker(age)}:", "=" * 80]
         
         for endpoint in endpoints:
-            print(f"  Name: {endpoint['name']}")
-            print(f"  Status: {endpoint['status']}")
-            print(f"  Live Version: {endpoint.get('liveVersion', 'N/A')}")
-            print(f"  Target Version: {endpoint.get('targetVersion', 'N/A')}")
-            if endpoint.get('description'):
-                print(f"  Description: {endpoint['description']}")
-            print("-" * 80)
+            name, status, live_version, target_version, description, created_at, updated_at, arn = _endpoint_fields(endpoint)
+            lines.append(
+                f"  Name: {name}\n"
+                f"  Status: {status}\n"
+                f"  Live Version: {live_version or 'N/A'}\n"
+                f"  Target Version: {target_version or 'N/A'}"
+            )
+            if description:
+                lines.append(f"  Description: {description}")
+            if verbose:
+                lines.append(
+                    f"  Created At: {created_at}\n"
+                    f"  Last Updated: {updated_at}\n"
+                    f"  Endpoint ARN: {arn}"
+                )
+            lines.append(separator)
+        
+        sys.stdout.write("\n".join(lines) + "\n")
             
     except Exception as e:
-        print(f"✗ Error listing endpoints: {e}")
-        sys.exit(1)
+        exit_on_error(e, {}, default="✗ Error listing endpoints: {error}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -161,9 +261,15 @@ Examples:
   # Create endpoint pointing to latest version
   python create_endpoint.py --agent-runtime-id testAgent-71evTo5Zf8 --name latest
   
+  # Create an endpoint and wait until it is READY
+  python create_endpoint.py --agent-runtime-id testAgent-71evTo5Zf8 --name staging --version 3 --wait
+  
   # List all endpoints
   python create_endpoint.py --agent-runtime-id testAgent-71evTo5Zf8 --list
   
+  # List all endpoints with full details
+  python create_endpoint.py --agent-runtime-id testAgent-71evTo5Zf8 --list --verbose
+  
   # Get specific endpoint details
   python create_endpoint.py --agent-runtime-id testAgent-71evTo5Zf8 --get dev
   
@@ -177,38 +283,39 @@ Examples:
     parser.add_argument('--version', help='Version number to point to (e.g., 3). Omit for latest version')
     parser.add_argument('--description', help='Description of the endpoint')
     parser.add_argument('--region', default='eu-central-1', help='AWS region (default: eu-central-1)')
+    parser.add_argument('--use-boto3', action='store_true', help='Send requests through boto3 instead of the lightweight SigV4 client')
     parser.add_argument('--list', action='store_true', help='List all endpoints')
+    parser.add_argument('--verbose', action='store_true', help='With --list, fetch full details for every endpoint')
     parser.add_argument('--get', metavar='ENDPOINT_NAME', help='Get details of a specific endpoint')
     parser.add_argument('--delete', metavar='ENDPOINT_NAME', help='Delete a specific endpoint')
-    parser.add_argument('--tag', action='append', metavar='KEY=VALUE', help='Add tags (can be used multiple times)')
+    parser.add_argument('--tag', action='append', type=_kv_pair, metavar='KEY=VALUE', help='Add tags (can be used multiple times)')
+    parser.add_argument('--wait', action='store_true', help='After creating, poll until the endpoint reaches a terminal status')
+    parser.add_argument('--wait-timeout', type=int, default=600, help='Maximum seconds to wait with --wait (default: 600)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the 60-second local cache for --list and --get and fetch live status')
     
     args = parser.parse_args()
     
     if args.list:
-        list_endpoints(args.agent_runtime_id, args.region)
+        list_endpoints(get_client(args.region, args.use_boto3), args.agent_runtime_id, args.verbose, not args.no_cache)
     elif args.get:
-        get_endpoint(args.agent_runtime_id, args.get, args.region)
+        get_endpoint(get_client(args.region, args.use_boto3), args.agent_runtime_id, args.get, not args.no_cache)
     elif args.delete:
-        delete_endpoint(args.agent_runtime_id, args.delete, args.region)
+        delete_endpoint(get_client(args.region, args.use_boto3), args.agent_runtime_id, args.delete)
     elif args.name:
-        tags = None
-        if args.tag:
-            tags = {}
-            for tag in args.tag:
-                if '=' not in tag:
-                    print(f"Error: Invalid tag format '{tag}'. Use KEY=VALUE")
-                    sys.exit(1)
-                key, value = tag.split('=', 1)
-                tags[key] = value
+        tags = dict(args.tag) if args.tag else None
+        client = get_client(args.region, args.use_boto3)
         
         create_endpoint(
+            client,
             args.agent_runtime_id,
             args.name,
             args.version,
             args.description,
-            tags,
-            args.region
+            tags
         )
+        
+        if args.wait:
+            wait_for_endpoint(client, args.agent_runtime_id, args.name, args.wait_timeout)
     else:
         print("Error: Specify --name to create, --list to list, --get to view, or --delete to remove an endpoint")
         parser.print_help()
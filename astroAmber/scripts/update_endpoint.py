@@ -4,65 +4,72 @@ Script to update AgentCore Runtime endpoint to a specific version.
 Usage: python update_endpoint.py --agent-runtime-id <id> --endpoint-name <name> --version <version>
 """
 
-import boto3
 import argparse
 import sys
+import uuid
+import _cache
+from _client import call_with_stale_retry, exit_on_error, get_client
 
-def update_endpoint(agent_runtime_id, endpoint_name, version, region='eu-central-1'):
+def update_endpoint(client, agent_runtime_id, endpoint_name, version):
     """Update an AgentCore Runtime endpoint to point to a specific version."""
     
-    client = boto3.client('bedrock-agentcore-control', region_name=region)
-    
     try:
         print(f"Updating endpoint '{endpoint_name}' to version {version}...")
         
-        response = client.update_agent_runtime_endpoint(
+        response = call_with_stale_retry(
+            client,
+            'update_agent_runtime_endpoint',
             agentRuntimeId=agent_runtime_id,
             endpointName=endpoint_name,
-            agentRuntimeVersion=str(version)
+            agentRuntimeVersion=str(version),
+            clientToken=str(uuid.uuid4())
         )
+        _cache.invalidate_endpoint(client.meta.region_name, agent_runtime_id, endpoint_name)
         
-        print(f"\n✓ Endpoint update initiated successfully!")
-        print(f"  Status: {response['status']}")
-        print(f"  Live Version: {response.get('liveVersion', 'N/A')}")
-        print(f"  Target Version: {response.get('targetVersion', 'N/A')}")
-        print(f"  Last Updated: {response['lastUpdatedAt']}")
+        sys.stdout.write(
+            f"\n✓ Endpoint update initiated successfully!\n"
+            f"  Status: {response['status']}\n"
+            f"  Live Version: {response.get('liveVersion', 'N/A')}\n"
+            f"  Target Version: {response.get('targetVersion', 'N/A')}\n"
+            f"  Last Updated: {response['lastUpdatedAt']}\n"
+        )
         
         return response
         
-    except client.exceptions.ResourceNotFoundException:
-        print(f"✗ Error: Agent runtime or endpoint not found")
-        sys.exit(1)
-    except client.exceptions.ValidationException as e:
-        print(f"✗ Validation Error: {e}")
-        sys.exit(1)
     except Exception as e:
-        print(f"✗ Error: {e}")
-        sys.exit(1)
+        exit_on_error(e, {
+            'ResourceNotFoundException': "✗ Error: Agent runtime or endpoint not found",
+            'ValidationException': "✗ Validation Error: {error}"
+        })
 
-def list_endpoints(agent_runtime_id, region='eu-central-1'):
+def list_endpoints(client, agent_runtime_id):
     """List all endpoints for an agent runtime."""
     
-    client = boto3.client('bedrock-agentcore-control', region_name=region)
-    
     try:
-        response = client.list_agent_runtime_endpoints(
-            agentRuntimeId=agent_runtime_id
+        # Follow nextToken so accounts with many endpoints are not truncated
+        paginator = client.get_paginator('list_agent_runtime_endpoints')
+        pages = paginator.paginate(
+            agentRuntimeId=agent_runtime_id,
+            PaginationConfig={'PageSize': 100}
         )
         
-        print(f"\nEndpoints for {agent_runtime_id}:")
-        print("-" * 80)
+        # Collect every line first so the whole listing goes out in a single write
+        lines = [f"\nEndpoints for {agent_runtime_id}:", "-" * 80]
         
-        for endpoint in response.get('agentRuntimeEndpoints', []):
-            print(f"  Name: {endpoint['name']}")
-            print(f"  Status: {endpoint['status']}")
-            print(f"  Live Version: {endpoint.get('liveVersion', 'N/A')}")
-            print(f"  Target Version: {endpoint.get('targetVersion', 'N/A')}")
-            print("-" * 80)
+        # search() flattens the endpoints of every page; it yields None for a page without the key
+        for endpoint in pages.search('runtimeEndpoints[]'):
+            if endpoint is None:
+                continue
+            lines.append(f"  Name: {endpoint['name']}")
+            lines.append(f"  Status: {endpoint['status']}")
+            lines.append(f"  Live Version: {endpoint.get('liveVersion', 'N/A')}")
+            lines.append(f"  Target Version: {endpoint.get('targetVersion', 'N/A')}")
+            lines.append("-" * 80)
+        
+        sys.stdout.write("\n".join(lines) + "\n")
             
     except Exception as e:
-        print(f"✗ Error listing endpoints: {e}")
-        sys.exit(1)
+        exit_on_error(e, {}, default="✗ Error listing endpoints: {error}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Update AgentCore Runtime endpoint version')
@@ -70,14 +77,15 @@ if __name__ == "__main__":
     parser.add_argument('--endpoint-name', help='Endpoint name (e.g., dev, DEFAULT)')
     parser.add_argument('--version', help='Version number to deploy (e.g., 4)')
     parser.add_argument('--region', default='eu-central-1', help='AWS region (default: eu-central-1)')
+    parser.add_argument('--use-boto3', action='store_true', help='Send requests through boto3 instead of the lightweight SigV4 client')
     parser.add_argument('--list', action='store_true', help='List all endpoints')
     
     args = parser.parse_args()
     
     if args.list:
-        list_endpoints(args.agent_runtime_id, args.region)
+        list_endpoints(get_client(args.region, args.use_boto3), args.agent_runtime_id)
     elif args.endpoint_name and args.version:
-        update_endpoint(args.agent_runtime_id, args.endpoint_name, args.version, args.region)
+        update_endpoint(get_client(args.region, args.use_boto3), args.agent_runtime_id, args.endpoint_name, args.version)
     else:
         print("Error: Either use --list or provide both --endpoint-name and --version")
         parser.print_help()
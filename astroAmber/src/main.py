@@ -1,13 +1,31 @@
 import os
+import re
+import time
+import asyncio
+import hashlib
+import datetime
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from contextvars import ContextVar
 from strands import Agent, tool
 from strands_tools.code_interpreter import AgentCoreCodeInterpreter
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from model.load import load_model
-import getpass
+from search_client.client import get_tavily_client
+from cache.ttl_cache import TTLCache
 from dotenv import load_dotenv
-from tavily import TavilyClient
 
-app = BedrockAgentCoreApp()
+
+@asynccontextmanager
+async def lifespan(starlette_app):
+    """
+    Close the shared Tavily client's connection pool when the app shuts down.
+    """
+    yield
+    await tavily_client.close()
+
+
+app = BedrockAgentCoreApp(lifespan=lifespan)
 log = app.logger
 
 REGION = os.getenv("AWS_REGION")
@@ -16,12 +34,124 @@ REGION = os.getenv("AWS_REGION")
 # Load environment variables from .env file
 load_dotenv()
 
-# Prompt the user to securely input the API key if not already set in the environment
-if not os.environ.get("TAVILY_API_KEY"):
-    os.environ["TAVILY_API_KEY"] = getpass.getpass("TAVILY_API_KEY:\n")
+# Read the API key once and fail fast when it is missing: the runtime has no TTY, so prompting would hang startup
+TAVILY_API_KEY = os.environ.get("TAVILY_API_KEY")
+if not TAVILY_API_KEY:
+    raise RuntimeError("TAVILY_API_KEY is not set; add it to the environment or a .env file")
+
+# Initialize a single async Tavily API client, shared by all tools for the lifetime of the app.
+# Its requests share one HTTP/2 connection pool, so concurrent tool calls are multiplexed
+tavily_client = get_tavily_client(api_key=TAVILY_API_KEY)
+
+# Build the shared Bedrock model at startup rather than on the first request
+load_model()
+
+# Limit how many fanned-out Tavily extract requests may be in flight at once, across all
+# concurrent sessions, to respect the account's rate limits
+tavily_semaphore = asyncio.Semaphore(8)
+
+# Matches the "url" field when the agent passes a JSON object instead of a bare URL
+URL_IN_JSON = re.compile(r'"url"\s*:\s*"([^"]+)"')
+
+# Session of the request currently being served, set by invoke and inherited by tool calls
+current_session_id = ContextVar("current_session_id", default="default")
+
+# URL -> page content already returned to the current request's tools, set by invoke
+session_url_contents = ContextVar("session_url_contents", default=None)
+
+# Exact-match cache of raw Tavily search results, namespaced by session, kept for 24 hours
+search_cache = TTLCache(maxsize=1024, ttl=24 * 60 * 60)
+
+# Content-addressed caches for per-URL extract results, crawl results and formatter output, kept for 7 days
+extract_cache = TTLCache(maxsize=1024, ttl=7 * 24 * 60 * 60)
+crawl_cache = TTLCache(maxsize=128, ttl=7 * 24 * 60 * 60)
+formatter_cache = TTLCache(maxsize=256, ttl=7 * 24 * 60 * 60)
+
+
+def content_hash(*parts):
+    """
+    Build a cache key from the SHA-256 of the given parts.
+
+    Args:
+        *parts: Values that together identify a cached result
+
+    Returns:
+        str: The hex digest of the repr of the parts tuple
+    """
+    # repr keeps None distinct from "None" and cannot be confused by separators inside a part
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+# Maximum characters of page content shown to the agent per extract / crawl result
+EXTRACT_MAX_CHARS = 5000
+CRAWL_MAX_CHARS = 4000
+
+
+def truncate_raw_content(docs, max_chars):
+    """
+    Trim oversized raw_content in place so the full page text can be freed immediately.
+
+    One character beyond max_chars is kept so the formatters still know the content was cut.
+
+    Args:
+        docs (List[Dict]): Tavily result documents
+        max_chars (int): The number of characters the formatter will display
+    """
+    for doc in docs:
+        raw_content = doc.get("raw_content")
+        if raw_content and len(raw_content) > max_chars + 1:
+            doc["raw_content"] = raw_content[: max_chars + 1]
+
+
+def remember_url_contents(docs):
+    """
+    Record page content from extract or crawl results for reuse by web_extract.
+
+    Content is kept up to the extract display limit, so a later extract of the same URL
+    within the request renders exactly as a fresh Tavily extract would.
+
+    Args:
+        docs (List[Dict]): Tavily result documents with 'url' and 'raw_content'
+    """
+    contents = session_url_contents.get()
+    if contents is None:
+        return
+
+    for doc in docs:
+        url = doc.get("url")
+        raw_content = doc.get("raw_content")
+        if url and raw_content:
+            contents[url] = raw_content[: EXTRACT_MAX_CHARS + 1]
+
+
+def format_search_doc(i, doc):
+    """
+    Format a single Tavily search result.
+
+    Args:
+        i (int): The 1-based rank of the result
+        doc (Dict): The Tavily search result document
+
+    Returns:
+        str: The formatted entry
+    """
+    # Strip once and reuse the result rather than stripping twice per document
+    raw_content = doc.get("raw_content")
+    stripped_content = raw_content.strip() if raw_content else ""
+
+    # Prefer raw_content if it's available and not just whitespace
+    if stripped_content:
+        content_line = f"Raw Content: {stripped_content}"
+    else:
+        # Fallback to content if raw_content is not suitable or not available
+        content_line = f"Content: {doc.get('content', '').strip()}"
+
+    return (
+        f"\nRESULT {i}:\n"
+        f"Title: {doc.get('title', 'No title')}\n"
+        f"URL: {doc.get('url', 'No URL')}\n"
+        f"{content_line}\n"
+    )
 
-# Initialize the Tavily API client using the loaded or provided API key
-tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 
 def format_search_results_for_agent(tavily_result):
     """
@@ -40,36 +170,14 @@ def format_search_results_for_agent(tavily_result):
     ):
         return "No search results found."
 
-    formatted_results = []
-
-    for i, doc in enumerate(tavily_result["results"], 1):
-        # Extract metadata
-        title = doc.get("title", "No title")
-        url = doc.get("url", "No URL")
-
-        # Create a formatted entry
-        formatted_doc = f"\nRESULT {i}:\n"
-        formatted_doc += f"Title: {title}\n"
-        formatted_doc += f"URL: {url}\n"
-
-        raw_content = doc.get("raw_content")
-
-        # Prefer raw_content if it's available and not just whitespace
-        if raw_content and raw_content.strip():
-            formatted_doc += f"Raw Content: {raw_content.strip()}\n"
-        else:
-            # Fallback to content if raw_content is not suitable or not available
-            content = doc.get("content", "").strip()
-            formatted_doc += f"Content: {content}\n"
-
-        formatted_results.append(formatted_doc)
-
     # Join all formatted results with a separator
-    return "\n" + "\n".join(formatted_results)
+    return "\n" + "\n".join(
+        format_search_doc(i, doc) for i, doc in enumerate(tavily_result["results"], 1)
+    )
 
 
 @tool
-def web_search(
+async def web_search(
     query: str, time_range: str | None = None, include_domains: str | None = None
 ) -> str:
     """Perform a web search. Returns the search results as a string, with the title, url, and content of each result ranked by relevance.
@@ -85,22 +193,67 @@ def web_search(
     Returns:
         formatted_results (str): The web search results
     """
-    client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-    formatted_results = format_search_results_for_agent(
-        client.search(
+    # Lists are unhashable, so normalize include_domains before building the cache key
+    domains_key = (
+        tuple(include_domains) if isinstance(include_domains, list) else include_domains
+    )
+    cache_key = (current_session_id.get(), query, time_range, domains_key)
+
+    tavily_result = search_cache.get(cache_key)
+    if tavily_result is None:
+        # No use_cache flag is sent: it is not a search parameter of tavily-python 0.7 or the
+        # Tavily API, and unknown fields are forwarded verbatim. search_cache covers repeats
+        tavily_result = await tavily_client.search(
             query=query,  # The search query to execute with Tavily.
             max_results=10,
             time_range=time_range,
             include_domains=include_domains,  # list of domains to specifically include in the search results.
         )
-    )
+        search_cache.set(cache_key, tavily_result)
+
+    formatted_results = format_search_results_for_agent(tavily_result)
     return formatted_results
-def format_extract_results_for_agent(tavily_result):
+def format_extract_doc(i, doc, max_chars=EXTRACT_MAX_CHARS):
+    """
+    Format a single Tavily extract result.
+
+    Args:
+        i (int): The 1-based position of the result
+        doc (Dict): The Tavily extract result document
+        max_chars (int, optional): Maximum content characters shown
+
+    Returns:
+        str: The formatted entry
+    """
+    raw_content = doc.get("raw_content", "")
+    images = doc.get("images", [])
+
+    if raw_content:
+        # Truncate very long content for readability
+        content = f"{raw_content[:max_chars]}..." if len(raw_content) > max_chars else raw_content
+    else:
+        content = "No content extracted"
+
+    entry = f"\nEXTRACT RESULT {i}:\nURL: {doc.get('url', 'No URL')}\nContent: {content}\n"
+
+    if not images:
+        return entry
+
+    # Show up to 3 images
+    image_lines = "".join(
+        f"  Image {j}: {image_url}\n" for j, image_url in enumerate(images[:3], 1)
+    )
+    more_images = f"  ... and {len(images) - 3} more images\n" if len(images) > 3 else ""
+    return f"{entry}Images found: {len(images)} images\n{image_lines}{more_images}"
+
+
+def format_extract_results_for_agent(tavily_result, max_chars=EXTRACT_MAX_CHARS):
     """
     Format Tavily extract results into a well-structured string for language models.
 
     Args:
         tavily_result (Dict): A Tavily extract result dictionary
+        max_chars (int, optional): Maximum content characters shown per result
 
     Returns:
         str: A formatted string with extract results organized for easy consumption by LLMs
@@ -108,54 +261,75 @@ def format_extract_results_for_agent(tavily_result):
     if not tavily_result or "results" not in tavily_result:
         return "No extract results found."
 
-    formatted_results = []
-
     # Process successful results
-    results = tavily_result.get("results", [])
-    for i, doc in enumerate(results, 1):
-        url = doc.get("url", "No URL")
-        raw_content = doc.get("raw_content", "")
-        images = doc.get("images", [])
-
-        formatted_doc = f"\nEXTRACT RESULT {i}:\n"
-        formatted_doc += f"URL: {url}\n"
-
-        if raw_content:
-            # Truncate very long content for readability
-            if len(raw_content) > 5000:
-                formatted_doc += f"Content: {raw_content[:5000]}...\n"
-            else:
-                formatted_doc += f"Content: {raw_content}\n"
-        else:
-            formatted_doc += "Content: No content extracted\n"
-
-        if images:
-            formatted_doc += f"Images found: {len(images)} images\n"
-            for j, image_url in enumerate(images[:3], 1):  # Show up to 3 images
-                formatted_doc += f"  Image {j}: {image_url}\n"
-            if len(images) > 3:
-                formatted_doc += f"  ... and {len(images) - 3} more images\n"
-
-        formatted_results.append(formatted_doc)
+    formatted_results = "".join(
+        format_extract_doc(i, doc, max_chars)
+        for i, doc in enumerate(tavily_result.get("results", []), 1)
+    )
 
     # Process failed results if any
     failed_results = tavily_result.get("failed_results", [])
+    failed_section = ""
     if failed_results:
-        formatted_results.append("\nFAILED EXTRACTIONS:\n")
-        for i, failure in enumerate(failed_results, 1):
-            url = failure.get("url", "Unknown URL")
-            error = failure.get("error", "Unknown error")
-            formatted_results.append(f"Failed {i}: {url} - {error}\n")
+        failed_section = "\nFAILED EXTRACTIONS:\n" + "".join(
+            f"Failed {i}: {failure.get('url', 'Unknown URL')} - {failure.get('error', 'Unknown error')}\n"
+            for i, failure in enumerate(failed_results, 1)
+        )
 
     # Add response time info
     response_time = tavily_result.get("response_time", 0)
-    formatted_results.append(f"\nResponse time: {response_time} seconds")
 
-    return "\n" + "".join(formatted_results)
+    return f"\n{formatted_results}{failed_section}\nResponse time: {response_time} seconds"
+
+
+async def extract_single_url(url, include_images, extract_depth):
+    """
+    Extract one URL with Tavily, holding a slot of the shared concurrency limit.
+
+    Args:
+        url (str): The URL to extract content from
+        include_images (bool): Whether to also extract image URLs from the page
+        extract_depth (str): The depth of extraction ('basic' or 'advanced')
+
+    Returns:
+        Dict: The Tavily extract response for this URL
+    """
+    async with tavily_semaphore:
+        return await tavily_client.extract(
+            urls=[url], include_images=include_images, extract_depth=extract_depth
+        )
+
+
+def merge_extract_responses(urls, responses):
+    """
+    Merge per-URL Tavily extract responses into the shape of a single batched response.
+
+    Args:
+        urls (List[str]): The URLs in the order they were requested
+        responses (List[Dict | Exception]): The matching responses, or the exception raised for a URL
+
+    Returns:
+        Dict: A combined extract result with results, failed_results and response_time
+    """
+    merged = {"results": [], "failed_results": [], "response_time": 0}
+
+    for url, response in zip(urls, responses):
+        if isinstance(response, Exception):
+            merged["failed_results"].append({"url": url, "error": str(response)})
+            continue
+
+        merged["results"].extend(response.get("results", []))
+        merged["failed_results"].extend(response.get("failed_results", []))
+        # Requests ran concurrently, so the slowest one is the wall-clock time
+        merged["response_time"] = max(
+            merged["response_time"], response.get("response_time", 0)
+        )
+
+    return merged
 
 
 @tool
-def web_extract(
+async def web_extract(
     urls: str | list[str], include_images: bool = False, extract_depth: str = "basic"
 ) -> str:
     """Extract content from one or more web pages using Tavily's extract API.
@@ -183,24 +357,66 @@ def web_extract(
         # Clean and validate URLs
         cleaned_urls = []
         for url in urls_list:
-            if url.strip().startswith("{") and '"url":' in url:
-                import re
-
-                m = re.search(r'"url"\s*:\s*"([^"]+)"', url)
-                if m:
-                    url = m.group(1)
+            m = URL_IN_JSON.search(url)
+            if m:
+                url = m.group(1)
 
             if not url.startswith(("http://", "https://")):
                 url = "https://" + url
 
             cleaned_urls.append(url)
 
-        # Call Tavily extract API
-        api_response = tavily_client.extract(
-            urls=cleaned_urls,  # List of URLs to extract content from
-            include_images=include_images,  # Whether to include image extraction
-            extract_depth=extract_depth,  # Depth of extraction (basic or advanced)
-        )
+        # Drop repeated URLs (keeping first-seen order) so each page is extracted only once
+        cleaned_urls = list(dict.fromkeys(cleaned_urls))
+
+        # Serve URLs whose content this request has already seen, then URLs extracted
+        # earlier with the same options, and only send the rest to Tavily. Session content
+        # carries no images and may come from a basic crawl, so it is only used for basic
+        # extractions without images.
+        session_contents = (
+            session_url_contents.get() if extract_depth == "basic" and not include_images else None
+        ) or {}
+        results_by_url = {}
+        pending_urls = []
+        for url in cleaned_urls:
+            if url in session_contents:
+                results_by_url[url] = {"url": url, "raw_content": session_contents[url]}
+                continue
+
+            doc = extract_cache.get(content_hash(url, include_images, extract_depth))
+            if doc is None:
+                pending_urls.append(url)
+            else:
+                results_by_url[url] = doc
+
+        if not pending_urls:
+            api_response = {"results": [], "failed_results": [], "response_time": 0}
+        elif extract_depth == "basic" and len(pending_urls) > 1:
+            # Fan out one request per URL so the extractions overlap instead of running serially
+            responses = await asyncio.gather(
+                *(extract_single_url(url, include_images, extract_depth) for url in pending_urls),
+                return_exceptions=True,
+            )
+            api_response = merge_extract_responses(pending_urls, responses)
+        else:
+            # Call Tavily extract API
+            api_response = await tavily_client.extract(
+                urls=pending_urls,  # List of URLs to extract content from
+                include_images=include_images,  # Whether to include image extraction
+                extract_depth=extract_depth,  # Depth of extraction (basic or advanced)
+            )
+
+        fetched_results = api_response.get("results", [])
+        truncate_raw_content(fetched_results, EXTRACT_MAX_CHARS)
+        remember_url_contents(fetched_results)
+        for doc in fetched_results:
+            extract_cache.set(content_hash(doc.get("url"), include_images, extract_depth), doc)
+            results_by_url[doc.get("url")] = doc
+
+        # Return results in the order the URLs were requested, whether cached or fetched;
+        # any result Tavily filed under a different URL follows at the end
+        ordered_results = [results_by_url.pop(url) for url in cleaned_urls if url in results_by_url]
+        api_response["results"] = ordered_results + list(results_by_url.values())
 
         # Format the results for the agent
         formatted_results = format_extract_results_for_agent(api_response)
@@ -209,12 +425,39 @@ def web_extract(
     except Exception as e:
         return f"Error during extraction: {e}\nURLs attempted: {urls}\nFailed to extract content."
 
-def format_crawl_results_for_agent(tavily_result):
+def format_crawl_doc(i, doc, max_chars=CRAWL_MAX_CHARS):
+    """
+    Format a single Tavily crawl result, starting with a separator line.
+
+    Args:
+        i (int): The 1-based position of the result
+        doc (Dict): The Tavily crawl result document
+        max_chars (int, optional): Maximum content characters shown
+
+    Returns:
+        str: The formatted entry
+    """
+    raw_content = doc.get("raw_content", "")
+    details = ""
+
+    if raw_content:
+        # Extract a title from the first line if available
+        # partition stops at the first newline instead of splitting the whole page
+        title_line = raw_content.partition("\n")[0]
+        content = f"{raw_content[:max_chars]}..." if len(raw_content) > max_chars else raw_content
+        details = f"Title: {title_line}\nContent: {content}\n"
+
+    # Start every entry with the separator so results are visually delimited
+    return f"{'-' * 40}\nRESULT {i}:\nURL: {doc.get('url', 'No URL')}\n{details}"
+
+
+def format_crawl_results_for_agent(tavily_result, max_chars=CRAWL_MAX_CHARS):
     """
     Format Tavily crawl results into a well-structured string for language models.
 
     Args:
         tavily_result (List[Dict]): A list of Tavily crawl result dictionaries
+        max_chars (int, optional): Maximum content characters shown per result
 
     Returns:
         formatted_results (str): The formatted crawl results
@@ -222,35 +465,13 @@ def format_crawl_results_for_agent(tavily_result):
     if not tavily_result:
         return "No crawl results found."
 
-    formatted_results = []
-
-    for i, doc in enumerate(tavily_result, 1):
-        # Extract metadata
-        url = doc.get("url", "No URL")
-        raw_content = doc.get("raw_content", "")
-
-        # Create a formatted entry
-        formatted_doc = f"\nRESULT {i}:\n"
-        formatted_doc += f"URL: {url}\n"
-
-        if raw_content:
-            # Extract a title from the first line if available
-            title_line = raw_content.split("\n")[0] if raw_content else "No title"
-            formatted_doc += f"Title: {title_line}\n"
-            formatted_doc += (
-                f"Content: {raw_content[:4000]}...\n"
-                if len(raw_content) > 4000
-                else f"Content: {raw_content}\n"
-            )
-
-        formatted_results.append(formatted_doc)
-
-    # Join all formatted results with a separator
-    return "\n" + "-" * 40 + "\n".join(formatted_results)
+    return "\n" + "\n".join(
+        format_crawl_doc(i, doc, max_chars) for i, doc in enumerate(tavily_result, 1)
+    )
 
 
 @tool
-def web_crawl(url: str, instructions: str | None = None) -> str:
+async def web_crawl(url: str, instructions: str | None = None) -> str:
     """
     Crawls a given URL, processes the results, and formats them into a string.
 
@@ -273,30 +494,40 @@ def web_crawl(url: str, instructions: str | None = None) -> str:
     max_depth = 2
     limit = 20
 
-    if url.strip().startswith("{") and '"url":' in url:
-        import re
-
-        m = re.search(r'"url"\s*:\s*"([^"]+)"', url)
-        if m:
-            url = m.group(1)
+    m = URL_IN_JSON.search(url)
+    if m:
+        url = m.group(1)
 
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
 
     try:
-        # Crawls the web using Tavily API
-        api_response = tavily_client.crawl(
-            url=url,  # The URL to crawl
-            max_depth=max_depth,  # Defines how far from the base URL the crawler can explore
-            limit=limit,  # Limits the number of results returned
-            instructions=instructions,  # Optional instructions for the crawler
-        )
+        cache_key = content_hash(url, max_depth, limit, instructions)
+        tavily_results = crawl_cache.get(cache_key)
+        if tavily_results is None:
+            # Crawls the web using Tavily API
+            api_response = await tavily_client.crawl(
+                url=url,  # The URL to crawl
+                max_depth=max_depth,  # Defines how far from the base URL the crawler can explore
+                limit=limit,  # Limits the number of results returned
+                instructions=instructions,  # Optional instructions for the crawler
+                extract_depth="basic",  # Basic extraction keeps the returned page content small
+            )
 
-        tavily_results = (
-            api_response.get("results")
-            if isinstance(api_response, dict)
-            else api_response
-        )
+            tavily_results = (
+                api_response.get("results")
+                if isinstance(api_response, dict)
+                else api_response
+            )
+
+            # Drop the bulk of each page as soon as it arrives, keeping enough of it for later
+            # extracts of the same pages; the formatter shows only CRAWL_MAX_CHARS
+            if tavily_results:
+                truncate_raw_content(tavily_results, EXTRACT_MAX_CHARS)
+                crawl_cache.set(cache_key, tavily_results)
+
+        if tavily_results:
+            remember_url_contents(tavily_results)
 
         formatted = format_crawl_results_for_agent(tavily_results)
         return formatted
@@ -336,7 +567,7 @@ Your final research response:
 
 
 @tool
-def format_research_response(
+async def format_research_response(
     research_content: str, format_style: str = None, user_query: str = None
 ) -> str:
     """Format research content into a well-structured, properly cited response.
@@ -354,8 +585,15 @@ def format_research_response(
         str: Professionally formatted research response with proper citations,
              clear structure, and appropriate style for the intended audience
     """
+    # Identical requests (e.g. retries) reuse the earlier formatting instead of another LLM call
+    cache_key = content_hash(format_style, user_query, research_content)
+    cached_response = formatter_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+
     try:
-        # Strands Agents SDK makes it easy to create a specialized agent
+        # Strands Agents SDK makes it easy to create a specialized agent. The model and its
+        # Bedrock client are shared; only the per-call conversation state is created here
         formatter_agent = Agent(
             model=load_model(),
             system_prompt=RESEARCH_FORMATTER_PROMPT,
@@ -373,16 +611,13 @@ def format_research_response(
         format_input += "Please format this research content according to the guidelines and appropriate style."
 
         # Call the agent and return its response
-        response = formatter_agent(format_input)
-        return str(response)
+        response = str(await formatter_agent.invoke_async(format_input))
+        formatter_cache.set(cache_key, response)
+        return response
     except Exception as e:
         return f"Error in research formatting: {str(e)}"
 
-import datetime
-
-today = datetime.datetime.today().strftime("%A, %B %d, %Y")
-
-SYSTEM_PROMPT = f"""
+SYSTEM_PROMPT_TEMPLATE = """
 You are an expert research assistant specializing in deep, comprehensive information gathering and analysis.
 You are equipped with advanced web tools: Web Search, Web Extract, and Web Crawl.
 Your mission is to conduct comprehensive, accurate, and up-to-date research, grounding your findings in credible web sources.
@@ -422,6 +657,94 @@ RULES:
 """
 
 
+@lru_cache(maxsize=1)
+def build_system_prompt(date: datetime.date) -> str:
+    """
+    Render the research agent's system prompt for the given date.
+
+    Cached on the date, so the prompt is built once per day and long-running
+    processes still pick up the new date after midnight.
+
+    Args:
+        date (datetime.date): The date to present to the agent as today
+
+    Returns:
+        str: The system prompt
+    """
+    return SYSTEM_PROMPT_TEMPLATE.format(today=date.strftime("%A, %B %d, %Y"))
+
+
+def first_text(block):
+    """
+    Return the text of the first content item of a message or tool result.
+
+    Args:
+        block (Dict): A message or toolResult with an optional 'content' list
+
+    Returns:
+        str: The first item's text, or an empty string if there is none
+    """
+    content = block.get("content")
+    return content[0].get("text", "") if content else ""
+
+
+# Tools available to the research agent, shared by every request
+RESEARCH_TOOLS = [
+    web_search,
+    web_extract,
+    web_crawl,
+    format_research_response,
+]
+
+# Text deltas are streamed to the client in batches of at least this many characters,
+# or whatever has arrived once this many seconds have passed since the last batch
+STREAM_FLUSH_CHARS = 256
+STREAM_FLUSH_SECONDS = 0.05
+
+class TextBuffer:
+    """
+    Collects streamed text deltas and hands them out as batched "thinking" events.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.chars = 0
+        self.last_flush = time.monotonic()
+
+    def add(self, text):
+        """
+        Buffer a text delta.
+
+        Args:
+            text (str): The delta received from the agent
+
+        Returns:
+            bool: True once enough text or time has accumulated to send a batch
+        """
+        self.parts.append(text)
+        self.chars += len(text)
+        return (
+            self.chars >= STREAM_FLUSH_CHARS
+            or time.monotonic() - self.last_flush >= STREAM_FLUSH_SECONDS
+        )
+
+    def thinking_event(self):
+        """
+        Join the buffered deltas into a single "thinking" event and empty the buffer.
+
+        Returns:
+            Dict: The streaming update carrying the combined text
+        """
+        event = {
+            "status": "thinking",
+            "content": "".join(self.parts)
+        }
+        self.parts.clear()
+        self.chars = 0
+        self.last_flush = time.monotonic()
+        return event
+
+
 @app.entrypoint
 async def invoke(payload, context):
     """
@@ -435,6 +758,8 @@ async def invoke(payload, context):
         dict: Streaming updates of research progress and final results
     """
     session_id = getattr(context, 'session_id', 'default')
+    current_session_id.set(session_id)
+    session_url_contents.set({})
     
     # Extract research query from payload
     # Handle both dict and string payloads
@@ -464,16 +789,12 @@ async def invoke(payload, context):
         "session_id": session_id
     }
     
-    # Create agent
+    # Create agent. Model, prompt and tools are shared; each request only gets its own
+    # conversation history so concurrent sessions never see each other's messages
     web_agent = Agent(
         model=load_model(),
-        system_prompt=SYSTEM_PROMPT,
-        tools=[
-            web_search,
-            web_extract,
-            web_crawl,
-            format_research_response,
-        ],
+        system_prompt=build_system_prompt(datetime.date.today()),
+        tools=RESEARCH_TOOLS,
     )
     
     yield {
@@ -482,26 +803,34 @@ async def invoke(payload, context):
     }
     
     # Execute research with streaming
-    tools_used = []
+    tools_used: dict[str, None] = {}  # insertion-ordered set of tool names
+    format_tool_use_ids = set()
     formatted_content = None
+    text_buffer = TextBuffer()
     
     try:
         # Stream agent execution using stream_async
         async for event in web_agent.stream_async(research_prompt):
-            # Handle text generation events
+            # Handle text generation events, batching per-token deltas
             if "data" in event:
-                yield {
-                    "status": "thinking",
-                    "content": event["data"]
-                }
+                if text_buffer.add(event["data"]):
+                    yield text_buffer.thinking_event()
             
             # Handle tool use events
             if "current_tool_use" in event:
+                # Send pending text first so it stays ahead of the tool update
+                if text_buffer.parts:
+                    yield text_buffer.thinking_event()
+                
                 tool_info = event["current_tool_use"]
                 tool_name = tool_info.get("name", "unknown")
                 
+                # Remember formatter calls so their results can be picked out after streaming
+                if tool_name == "format_research_response" and tool_info.get("toolUseId"):
+                    format_tool_use_ids.add(tool_info["toolUseId"])
+                
                 if tool_name not in tools_used:
-                    tools_used.append(tool_name)
+                    tools_used[tool_name] = None
                     
                     # Choose emoji based on tool type
                     if "crawl" in tool_name:
@@ -530,28 +859,27 @@ async def invoke(payload, context):
                 result = event["result"]
                 break
         
-        # Extract formatted research response from messages
-        for msg in web_agent.messages:
-            if msg.get("role") == "user":
-                for content in msg.get("content", []):
-                    tool_result = content.get("toolResult", {})
-                    if tool_result.get("status") == "success":
-                        tool_use_id = tool_result.get("toolUseId", "")
-                        
-                        # Find the matching tool use in assistant messages
-                        for assistant_msg in web_agent.messages:
-                            if assistant_msg.get("role") == "assistant":
-                                for assistant_content in assistant_msg.get("content", []):
-                                    tool_use = assistant_content.get("toolUse", {})
-                                    if (
-                                        tool_use.get("toolUseId") == tool_use_id
-                                        and tool_use.get("name") == "format_research_response"
-                                    ):
-                                        formatted_content = tool_result.get("content", [{}])[0].get("text", "")
-                                        break
+        if text_buffer.parts:
+            yield text_buffer.thinking_event()
+        
+        # Extract formatted research response from messages in a single pass,
+        # keeping the latest successful format_research_response result
+        # (skipped entirely when the formatter was never called)
+        if format_tool_use_ids:
+            for msg in web_agent.messages:
+                if msg.get("role") != "user":
+                    continue
+                for content in msg.get("content") or ():
+                    tool_result = content.get("toolResult")
+                    if (
+                        tool_result
+                        and tool_result.get("status") == "success"
+                        and tool_result.get("toolUseId") in format_tool_use_ids
+                    ):
+                        formatted_content = first_text(tool_result)
         
         # Get final response
-        final_response = web_agent.messages[-1].get("content", [{}])[0].get("text", "") if web_agent.messages else ""
+        final_response = first_text(web_agent.messages[-1]) if web_agent.messages else ""
         
         log.info(f"Completed {len(tools_used)} tool invocations")
         
@@ -559,7 +887,7 @@ async def invoke(payload, context):
         yield {
             "status": "completed",
             "formatted_response": formatted_content or final_response,
-            "tools_used": tools_used,
+            "tools_used": list(tools_used),
             "tool_count": len(tools_used),
             "session_id": session_id,
             "message": f"Research completed with {len(tools_used)} tool invocations"
@@ -567,6 +895,8 @@ async def invoke(payload, context):
         
     except Exception as e:
         log.error(f"Error during research: {str(e)}")
+        if text_buffer.parts:
+            yield text_buffer.thinking_event()
         yield {
             "status": "error",
             "error": str(e),
@@ -575,4 +905,5 @@ async def invoke(payload, context):
 
 
 if __name__ == "__main__":
+    # uvicorn's default loop="auto" serves on uvloop where it is installed (not on Windows)
     app.run()
\ No newline at end of file
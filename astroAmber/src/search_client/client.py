@@ -0,0 +1,27 @@
+import httpx
+from tavily import AsyncTavilyClient
+
+class PooledAsyncTavilyClient(AsyncTavilyClient):
+    """
+    AsyncTavilyClient whose persistent connection pool speaks HTTP/2.
+    The SDK's own pool is HTTP/1.1 with default limits; this swaps it for one that lets
+    concurrent tool calls multiplex over shared connections. close() releases it as before.
+    """
+
+    def __init__(self, api_key: str):
+        super().__init__(api_key=api_key)
+        sdk_client = self._client
+        # Reuse the SDK's base URL and headers (auth, client source, project) unchanged
+        self._client = httpx.AsyncClient(
+            base_url=sdk_client.base_url,
+            headers=sdk_client.headers,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+
+def get_tavily_client(api_key: str) -> PooledAsyncTavilyClient:
+    """
+    Returns an async Tavily client backed by a shared HTTP/2 connection pool
+    """
+    return PooledAsyncTavilyClient(api_key=api_key)
\ No newline at end of file
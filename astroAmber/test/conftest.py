@@ -0,0 +1,21 @@
+import pytest
+
+class FakeClock:
+    """Stand-in for a time function whose reading only changes when a test advances it."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Return a factory that patches the given time function (e.g. module.time, "monotonic") with a FakeClock."""
+
+    def install(target, name):
+        clock = FakeClock()
+        monkeypatch.setattr(target, name, clock)
+        return clock
+
+    return install
\ No newline at end of file
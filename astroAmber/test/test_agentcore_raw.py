@@ -0,0 +1,213 @@
+import json
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import urllib3
+
+# The endpoint scripts import their helpers as sibling modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import _agentcore_raw
+from _agentcore_raw import AgentCoreControlClient, AgentCoreControlError
+from _client import error_code
+
+REGION = "eu-central-1"
+
+class FakeResponse:
+    def __init__(self, status=200, payload=None, data=None, headers=None):
+        self.status = status
+        self.data = data if data is not None else json.dumps(payload or {}).encode()
+        self.headers = headers or {}
+
+class FakePoolManager:
+    """Records requests and answers them from a queue instead of opening connections."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.requests = []
+        self.responses = []
+
+    def request(self, method, url, body=None, headers=None):
+        self.requests.append({"method": method, "url": url, "body": body, "headers": headers})
+        return self.responses.pop(0)
+
+class FakeProxyManager(FakePoolManager):
+    def __init__(self, proxy_url, **kwargs):
+        super().__init__(**kwargs)
+        self.proxy_url = proxy_url
+
+@pytest.fixture(autouse=True)
+def aws_env(monkeypatch, tmp_path):
+    """Static credentials, no shared config, and no endpoint or proxy overrides from the host."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.setenv("AWS_CONFIG_FILE", str(tmp_path / "config"))
+    monkeypatch.setenv("AWS_SHARED_CREDENTIALS_FILE", str(tmp_path / "credentials"))
+    for name in ("AWS_PROFILE", "AWS_SESSION_TOKEN", "AWS_ENDPOINT_URL", "AWS_ENDPOINT_URL_BEDROCK_AGENTCORE_CONTROL",
+                 "HTTPS_PROXY", "https_proxy", "HTTP_PROXY", "http_proxy", "NO_PROXY", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(urllib3, "PoolManager", FakePoolManager)
+    monkeypatch.setattr(urllib3, "ProxyManager", FakeProxyManager)
+
+@pytest.fixture
+def client():
+    return AgentCoreControlClient(REGION)
+
+class TestRequests:
+
+    def test_create_sends_signed_put(self, client):
+        """Test create sends the body as JSON to the endpoints collection with a SigV4 signature"""
+        client._http.responses.append(FakeResponse(202, {"endpointName": "dev", "status": "CREATING"}))
+
+        response = client.create_agent_runtime_endpoint(agentRuntimeId="agent-1", name="dev", clientToken="token")
+
+        assert response == {"endpointName": "dev", "status": "CREATING"}
+        request = client._http.requests[0]
+        assert request["method"] == "PUT"
+        assert request["url"] == f"https://bedrock-agentcore-control.{REGION}.amazonaws.com/runtimes/agent-1/runtime-endpoints/"
+        assert json.loads(request["body"]) == {"name": "dev", "clientToken": "token"}
+        assert f"/{REGION}/bedrock-agentcore/aws4_request" in request["headers"]["Authorization"]
+
+    def test_endpoint_name_is_quoted(self, client):
+        """Test path parameters are percent-encoded"""
+        client._http.responses.append(FakeResponse(200, {"name": "a/b"}))
+
+        client.get_agent_runtime_endpoint(agentRuntimeId="agent-1", endpointName="a/b")
+
+        assert client._http.requests[0]["url"].endswith("/runtimes/agent-1/runtime-endpoints/a%2Fb/")
+
+    def test_endpoint_url_override(self, monkeypatch):
+        """Test AWS_ENDPOINT_URL redirects requests like it does for boto3"""
+        monkeypatch.setenv("AWS_ENDPOINT_URL", "http://localhost:4566/")
+        client = AgentCoreControlClient(REGION)
+        client._http.responses.append(FakeResponse(202, {}))
+
+        client.delete_agent_runtime_endpoint(agentRuntimeId="agent-1", endpointName="dev")
+
+        assert client._http.requests[0]["url"] == "http://localhost:4566/runtimes/agent-1/runtime-endpoints/dev/"
+
+    def test_service_specific_endpoint_url_wins(self, monkeypatch):
+        """Test the service-specific endpoint variable takes precedence over the global one"""
+        monkeypatch.setenv("AWS_ENDPOINT_URL", "http://global:1")
+        monkeypatch.setenv("AWS_ENDPOINT_URL_BEDROCK_AGENTCORE_CONTROL", "http://service:2")
+
+        assert AgentCoreControlClient(REGION)._base_url == "http://service:2"
+
+    def test_retries_return_final_error_response(self, client):
+        """Test exhausted status retries surface the service response instead of MaxRetryError"""
+        retries = client._http.kwargs["retries"]
+        assert retries.raise_on_status is False
+        assert 503 in retries.status_forcelist
+
+class TestProxy:
+
+    def test_https_proxy_is_used(self, monkeypatch):
+        """Test HTTPS_PROXY routes requests through a proxy manager"""
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.internal:3128")
+
+        client = AgentCoreControlClient(REGION)
+
+        assert isinstance(client._http, FakeProxyManager)
+        assert client._http.proxy_url == "http://proxy.internal:3128"
+
+    def test_no_proxy_bypasses_proxy(self, monkeypatch):
+        """Test NO_PROXY exempts the control-plane host"""
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.internal:3128")
+        monkeypatch.setenv("NO_PROXY", ".amazonaws.com")
+
+        client = AgentCoreControlClient(REGION)
+
+        assert not isinstance(client._http, FakeProxyManager)
+
+class TestErrors:
+
+    def test_error_code_from_header(self, client):
+        """Test the service error code is taken from x-amzn-ErrorType"""
+        client._http.responses.append(FakeResponse(
+            409,
+            {"message": "Endpoint already exists"},
+            headers={"x-amzn-ErrorType": "ConflictException:http://internal.amazon.com/"}
+        ))
+
+        with pytest.raises(AgentCoreControlError) as excinfo:
+            client.create_agent_runtime_endpoint(agentRuntimeId="agent-1", name="dev")
+
+        assert error_code(excinfo.value) == "ConflictException"
+        assert excinfo.value.status == 409
+        assert "Endpoint already exists" in str(excinfo.value)
+
+    def test_error_code_from_body(self, client):
+        """Test the error code falls back to the body's __type"""
+        client._http.responses.append(FakeResponse(
+            404,
+            {"__type": "com.amazonaws#ResourceNotFoundException", "Message": "No such endpoint"}
+        ))
+
+        with pytest.raises(AgentCoreControlError) as excinfo:
+            client.get_agent_runtime_endpoint(agentRuntimeId="agent-1", endpointName="dev")
+
+        assert excinfo.value.code == "ResourceNotFoundException"
+        assert "No such endpoint" in str(excinfo.value)
+
+    def test_non_json_error_body(self, client):
+        """Test an HTML error page from a proxy becomes a service error rather than a JSON error"""
+        client._http.responses.append(FakeResponse(502, data=b"<html>Bad Gateway</html>"))
+
+        with pytest.raises(AgentCoreControlError) as excinfo:
+            client.get_agent_runtime_endpoint(agentRuntimeId="agent-1", endpointName="dev")
+
+        assert excinfo.value.code == "UnknownError"
+        assert excinfo.value.status == 502
+        assert "Bad Gateway" in str(excinfo.value)
+
+    def test_non_json_success_body(self, client):
+        """Test a successful status with an unparseable body is reported, not returned"""
+        client._http.responses.append(FakeResponse(200, data=b"OK"))
+
+        with pytest.raises(AgentCoreControlError) as excinfo:
+            client.get_agent_runtime_endpoint(agentRuntimeId="agent-1", endpointName="dev")
+
+        assert excinfo.value.code == "InvalidResponse"
+
+class TestPaginator:
+
+    def test_search_follows_next_token(self, client):
+        """Test search() yields endpoints from every page, passing nextToken and the page size"""
+        client._http.responses.extend([
+            FakeResponse(200, {"runtimeEndpoints": [{"name": "dev"}, {"name": "staging"}], "nextToken": "page-2"}),
+            FakeResponse(200, {"runtimeEndpoints": [{"name": "prod"}]}),
+        ])
+        pages = client.get_paginator("list_agent_runtime_endpoints").paginate(
+            agentRuntimeId="agent-1",
+            PaginationConfig={"PageSize": 100}
+        )
+
+        names = [endpoint["name"] for endpoint in pages.search("runtimeEndpoints[]")]
+
+        assert names == ["dev", "staging", "prod"]
+        first, second = (parse_qs(urlsplit(request["url"]).query) for request in client._http.requests)
+        assert first == {"maxResults": ["100"]}
+        assert second == {"maxResults": ["100"], "nextToken": ["page-2"]}
+        assert all(request["method"] == "POST" for request in client._http.requests)
+
+    def test_search_yields_none_for_missing_key(self, client):
+        """Test a page without the key yields None, as botocore's search() does"""
+        client._http.responses.append(FakeResponse(200, {}))
+        pages = client.get_paginator("list_agent_runtime_endpoints").paginate(agentRuntimeId="agent-1")
+
+        assert list(pages.search("runtimeEndpoints[]")) == [None]
+
+    def test_unknown_paginator(self, client):
+        """Test only the endpoint listing has a paginator"""
+        with pytest.raises(ValueError):
+            client.get_paginator("list_agent_runtimes")
+
+def test_get_raw_client_is_cached():
+    """Test the raw client is built once per region"""
+    _agentcore_raw.get_raw_client.cache_clear()
+
+    assert _agentcore_raw.get_raw_client(REGION) is _agentcore_raw.get_raw_client(REGION)
+
+    _agentcore_raw.get_raw_client.cache_clear()
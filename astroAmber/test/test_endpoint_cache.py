@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The endpoint scripts import their helpers as sibling modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import _cache
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(_cache.time, "time")
+
+def test_round_trip(clock):
+    """Test a stored value is read back with its age"""
+    key = _cache.endpoint_key("eu-central-1", "agent-1", "dev")
+    _cache.set(key, {"name": "dev", "status": "READY"})
+    clock.now += 5
+
+    assert _cache.get(key) == {"name": "dev", "status": "READY"}
+    assert _cache.get_with_age(key) == ({"name": "dev", "status": "READY"}, 5)
+
+def test_expired_entry_is_a_miss(clock):
+    """Test an entry older than the TTL is ignored"""
+    key = _cache.endpoint_key("eu-central-1", "agent-1", "dev")
+    _cache.set(key, {"name": "dev"})
+    clock.now += 61
+
+    assert _cache.get(key) is None
+    assert _cache.get(key, ttl=120) == {"name": "dev"}
+
+def test_missing_entry_is_a_miss():
+    """Test a key that was never stored is a miss"""
+    assert _cache.get_with_age(["nothing"]) == (None, None)
+
+def test_datetimes_are_stored_as_strings(clock):
+    """Test non-JSON values such as boto3 timestamps are stored via str()"""
+    from datetime import datetime
+
+    key = ["endpoint"]
+    _cache.set(key, {"createdAt": datetime(2025, 1, 2, 3, 4, 5)})
+
+    assert _cache.get(key) == {"createdAt": "2025-01-02 03:04:05"}
+
+@pytest.mark.parametrize("content", ["not json", "[1, 2]", '{"value": 1}', '{"storedAt": "yesterday", "value": 1}'])
+def test_corrupt_entry_is_a_miss(cache_dir, content):
+    """Test unreadable or foreign cache files are treated as a miss instead of raising"""
+    key = ["endpoint"]
+    cache_dir.mkdir(parents=True)
+    Path(_cache._path(key)).write_text(content)
+
+    assert _cache.get(key) is None
+
+def test_invalidate_endpoint_clears_endpoint_and_listings():
+    """Test a write clears the endpoint entry and both listing variants"""
+    keys = [
+        _cache.endpoint_key("eu-central-1", "agent-1", "dev"),
+        _cache.listing_key("eu-central-1", "agent-1", verbose=False),
+        _cache.listing_key("eu-central-1", "agent-1", verbose=True),
+    ]
+    other = _cache.endpoint_key("eu-central-1", "agent-1", "prod")
+    for key in keys + [other]:
+        _cache.set(key, {"cached": True})
+
+    _cache.invalidate_endpoint("eu-central-1", "agent-1", "dev")
+
+    assert all(_cache.get(key) is None for key in keys)
+    assert _cache.get(other) == {"cached": True}
+
+def test_unwritable_cache_is_ignored(monkeypatch, tmp_path):
+    """Test the cache is best-effort when its directory cannot be created"""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(_cache, "CACHE_DIR", str(blocker / "cache"))
+
+    _cache.set(["key"], {"value": 1})
+
+    assert _cache.get(["key"]) is None
\ No newline at end of file
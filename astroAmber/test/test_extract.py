@@ -0,0 +1,192 @@
+import asyncio
+import os
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports; main refuses to import without a Tavily key
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("TAVILY_API_KEY", "test-key")
+
+import main
+from cache.ttl_cache import TTLCache
+from main import merge_extract_responses
+
+class StubTavilyClient:
+    """Records extract calls and answers them with content naming the URL and depth."""
+
+    def __init__(self):
+        self.extract_calls = []
+        self.crawl_calls = []
+
+    async def extract(self, urls, include_images=False, extract_depth="basic"):
+        self.extract_calls.append((list(urls), extract_depth))
+        return {
+            "results": [{"url": url, "raw_content": f"{extract_depth} content of {url}"} for url in urls],
+            "failed_results": [],
+            "response_time": 0.1,
+        }
+
+    async def crawl(self, url, **kwargs):
+        self.crawl_calls.append(url)
+        return {"results": [{"url": f"{url}/page", "raw_content": f"crawled content of {url}/page"}]}
+
+@pytest.fixture
+def tavily(monkeypatch):
+    stub = StubTavilyClient()
+    monkeypatch.setattr(main, "tavily_client", stub)
+    monkeypatch.setattr(main, "extract_cache", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(main, "crawl_cache", TTLCache(maxsize=16, ttl=60))
+    return stub
+
+def in_request(*steps):
+    """Run tool calls one after another within a single request, as invoke does."""
+
+    async def request():
+        main.session_url_contents.set({})
+        return [await step() for step in steps]
+
+    return asyncio.run(request())
+
+def result_urls(output):
+    return re.findall(r"^URL: (\S+)$", output, flags=re.M)
+
+class TestMergeExtractResponses:
+
+    def test_merges_results_and_failures(self):
+        """Test per-URL results and failures are concatenated in request order"""
+        responses = [
+            {"results": [{"url": "https://a.com", "raw_content": "A"}], "failed_results": [], "response_time": 0.4},
+            {"results": [], "failed_results": [{"url": "https://b.com", "error": "timeout"}], "response_time": 1.2},
+            {"results": [{"url": "https://c.com", "raw_content": "C"}], "response_time": 0.7},
+        ]
+
+        merged = merge_extract_responses(["https://a.com", "https://b.com", "https://c.com"], responses)
+
+        assert [doc["url"] for doc in merged["results"]] == ["https://a.com", "https://c.com"]
+        assert merged["failed_results"] == [{"url": "https://b.com", "error": "timeout"}]
+
+    def test_response_time_is_slowest_request(self):
+        """Test concurrent requests report the longest response time"""
+        responses = [{"results": [], "response_time": 0.4}, {"results": [], "response_time": 1.2}]
+
+        assert merge_extract_responses(["https://a.com", "https://b.com"], responses)["response_time"] == 1.2
+
+    def test_exception_becomes_failed_result(self):
+        """Test a URL whose request raised is reported as failed with the error text"""
+        responses = [
+            {"results": [{"url": "https://a.com", "raw_content": "A"}], "response_time": 0.4},
+            TimeoutError("Request timed out"),
+        ]
+
+        merged = merge_extract_responses(["https://a.com", "https://b.com"], responses)
+
+        assert [doc["url"] for doc in merged["results"]] == ["https://a.com"]
+        assert merged["failed_results"] == [{"url": "https://b.com", "error": "Request timed out"}]
+        assert merged["response_time"] == 0.4
+
+    def test_all_failed(self):
+        """Test every request failing yields no results and zero response time"""
+        merged = merge_extract_responses(["https://a.com"], [RuntimeError("boom")])
+
+        assert merged == {
+            "results": [],
+            "failed_results": [{"url": "https://a.com", "error": "boom"}],
+            "response_time": 0,
+        }
+
+class TestWebExtractOrder:
+
+    def test_cache_hits_keep_requested_order(self, tavily):
+        """Test cached and freshly fetched results come back in the order the URLs were requested"""
+        in_request(lambda: main.web_extract(["https://a.com"]))
+
+        output, = in_request(lambda: main.web_extract(["https://b.com", "https://a.com", "https://c.com"]))
+
+        assert result_urls(output) == ["https://b.com", "https://a.com", "https://c.com"]
+        assert tavily.extract_calls[1:] == [(["https://b.com"], "basic"), (["https://c.com"], "basic")]
+
+    def test_duplicate_urls_are_extracted_once(self, tavily):
+        """Test repeated URLs are fetched and listed once, in first-seen order"""
+        output, = in_request(lambda: main.web_extract(["https://b.com", "https://a.com", "https://b.com"]))
+
+        assert result_urls(output) == ["https://b.com", "https://a.com"]
+        assert len(tavily.extract_calls) == 2
+
+class TestWebExtractSources:
+
+    def test_basic_extract_reuses_crawled_page(self, tavily):
+        """Test a basic extract of a page crawled earlier in the request skips Tavily"""
+        _, output = in_request(
+            lambda: main.web_crawl("https://a.com"),
+            lambda: main.web_extract("https://a.com/page"),
+        )
+
+        assert tavily.extract_calls == []
+        assert "crawled content of https://a.com/page" in output
+
+    def test_advanced_extract_of_crawled_page_calls_tavily(self, tavily):
+        """Test crawl content, which is basic, never stands in for an advanced extract"""
+        _, output = in_request(
+            lambda: main.web_crawl("https://a.com"),
+            lambda: main.web_extract("https://a.com/page", extract_depth="advanced"),
+        )
+
+        assert tavily.extract_calls == [(["https://a.com/page"], "advanced")]
+        assert "advanced content of https://a.com/page" in output
+
+    def test_extract_with_images_calls_tavily(self, tavily):
+        """Test crawl content carries no images, so image extracts go to Tavily"""
+        in_request(
+            lambda: main.web_crawl("https://a.com"),
+            lambda: main.web_extract("https://a.com/page", include_images=True),
+        )
+
+        assert tavily.extract_calls == [(["https://a.com/page"], "basic")]
+
+    def test_crawled_pages_are_not_shared_across_requests(self, tavily):
+        """Test page content seen in one request is not reused by the next"""
+        in_request(lambda: main.web_crawl("https://a.com"))
+
+        in_request(lambda: main.web_extract("https://a.com/page"))
+
+        assert tavily.extract_calls == [(["https://a.com/page"], "basic")]
+
+    def test_extract_cache_is_keyed_by_depth(self, tavily):
+        """Test a repeated extract is cached, but only for the same depth"""
+        in_request(lambda: main.web_extract("https://a.com"))
+        in_request(lambda: main.web_extract("https://a.com"))
+        in_request(lambda: main.web_extract("https://a.com", extract_depth="advanced"))
+
+        assert tavily.extract_calls == [(["https://a.com"], "basic"), (["https://a.com"], "advanced")]
+
+    def test_basic_extracts_fan_out(self, tavily):
+        """Test several basic URLs are fetched with one request each"""
+        in_request(lambda: main.web_extract(["https://a.com", "https://b.com"]))
+
+        assert tavily.extract_calls == [(["https://a.com"], "basic"), (["https://b.com"], "basic")]
+
+    def test_advanced_extracts_are_batched(self, tavily):
+        """Test several advanced URLs are sent in a single batched request"""
+        in_request(lambda: main.web_extract(["https://a.com", "https://b.com"], extract_depth="advanced"))
+
+        assert tavily.extract_calls == [(["https://a.com", "https://b.com"], "advanced")]
+
+class TestWebCrawlCache:
+
+    def test_repeated_crawl_calls_tavily_once(self, tavily):
+        """Test a repeated crawl is served from the cache with identical output"""
+        first, = in_request(lambda: main.web_crawl("https://a.com"))
+        second, = in_request(lambda: main.web_crawl("https://a.com"))
+
+        assert tavily.crawl_calls == ["https://a.com"]
+        assert first == second
+
+    def test_crawl_cache_is_keyed_by_instructions(self, tavily):
+        """Test crawls with different instructions are fetched separately"""
+        in_request(lambda: main.web_crawl("https://a.com"))
+        in_request(lambda: main.web_crawl("https://a.com", instructions="Only pricing pages"))
+
+        assert tavily.crawl_calls == ["https://a.com", "https://a.com"]
\ No newline at end of file
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cache import ttl_cache
+from cache.ttl_cache import TTLCache
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(ttl_cache.time, "monotonic")
+
+class TestExpiry:
+
+    def test_hit_before_ttl(self, clock):
+        """Test a value is returned until its TTL has passed"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("key", "value")
+
+        clock.now += 60
+
+        assert cache.get("key") == "value"
+
+    def test_miss_after_ttl(self, clock):
+        """Test an expired value is dropped and reported as missing"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("key", "value")
+
+        clock.now += 61
+
+        assert cache.get("key") is None
+        assert "key" not in cache._entries
+
+    def test_set_refreshes_ttl(self, clock):
+        """Test storing a key again restarts its TTL"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("key", "old")
+        clock.now += 50
+        cache.set("key", "new")
+
+        clock.now += 50
+
+        assert cache.get("key") == "new"
+
+    def test_missing_key(self, clock):
+        """Test a key that was never stored is a miss"""
+        assert TTLCache(maxsize=10, ttl=60).get("key") is None
+
+class TestEviction:
+
+    def test_evicts_least_recently_stored(self, clock):
+        """Test the oldest entry is evicted once maxsize is exceeded"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+    def test_get_marks_entry_recently_used(self, clock):
+        """Test reading an entry protects it from the next eviction"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    def test_overwrite_does_not_grow(self, clock):
+        """Test overwriting a key keeps a single entry for it"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("a", 2)
+        cache.set("b", 3)
+
+        assert cache.get("a") == 2
+        assert cache.get("b") == 3
\ No newline at end of file